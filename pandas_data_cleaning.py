@@ -1,9 +1,20 @@
 # %%
+import functools
+import hashlib
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
+from IPython.display import display
+
+# %%
+# Set to True to display the exploratory output of each step
+# Leaving it off skips the inspection calls when the pipeline is run as a script
+DEBUG = False
 
 # %%
-pd.__version__
+if DEBUG:
+    display(pd.__version__)
 
 # %% [markdown]
 # ## About the Dataset 
@@ -20,9 +31,33 @@ pd.__version__
 # 
 
 # %%
-# Load the datasets directly from GitHub repository
-bios = pd.read_csv('https://github.com/KeithGalli/Olympics-Dataset/raw/refs/heads/master/athletes/bios.csv')
-results = pd.read_csv('https://github.com/KeithGalli/Olympics-Dataset/raw/refs/heads/master/results/results.csv')
+# Downloaded datasets are cached locally as Parquet so later runs skip the download and CSV parsing
+CACHE_DIR = Path('cache')
+
+@functools.lru_cache(maxsize=None)
+def load_dataset(url, name, usecols=None):
+    """Load a CSV dataset from url, reusing the local Parquet copy when it exists."""
+    # The cache file is keyed on url and usecols, so changing either one triggers a fresh download
+    cache_key = hashlib.sha256(repr((url, usecols)).encode()).hexdigest()[:12]
+    cache_path = CACHE_DIR / f'{name}-{cache_key}.parquet'
+    if cache_path.exists():
+        return pd.read_parquet(cache_path, engine='pyarrow', dtype_backend='pyarrow')
+    # The pyarrow engine parses in parallel and keeps text columns as Arrow-backed strings,
+    # so the .str methods used during cleaning run on Arrow compute kernels
+    dataset = pd.read_csv(url, engine='pyarrow', dtype_backend='pyarrow', usecols=usecols)
+    CACHE_DIR.mkdir(exist_ok=True)
+    dataset.to_parquet(cache_path, engine='pyarrow', compression='snappy', index=False)
+    return dataset
+
+# %%
+# Load the datasets from GitHub repository (or the local cache)
+bios = load_dataset('https://github.com/KeithGalli/Olympics-Dataset/raw/refs/heads/master/athletes/bios.csv', 'bios')
+
+# Skip columns of results that are empty, redundant, or will be sourced from bios dataset
+# Unnamed: 7 is completely empty, Nationality will come from bios via athlete_id join
+# As column is redundant since name on `bios` dataset exists
+results = load_dataset('https://github.com/KeithGalli/Olympics-Dataset/raw/refs/heads/master/results/results.csv', 'results',
+                       usecols=('athlete_id','NOC','Games','Event','Team','Pos','Medal','Discipline'))
 
 # %% [markdown]
 # ### Use Case
@@ -41,37 +76,44 @@ results = pd.read_csv('https://github.com/KeithGalli/Olympics-Dataset/raw/refs/h
 
 # %%
 # Examine the structure of raw biographical data
-bios.head()
+if DEBUG:
+    display(bios.head())
 
 # %%
 # Identify data types, missing values, and memory usage
 # This helps plan the cleaning strategy
-bios.info()
+if DEBUG:
+    bios.info()
 
 # %%
 # Find records of people who didn't compete in Olympic Games
 # These may need to be filtered out or handled separately
-bios.loc[~bios['Roles'].str.contains('Competed in Olympic Games')]
+# The mask is computed once and reused when filtering the cleaned dataset
+competed_olympics = bios['Roles'].str.contains('Competed in Olympic Games', regex=False, na=False)
+if DEBUG:
+    display(bios.loc[~competed_olympics])
 
 # %%
 # Identify edge cases: people who didn't compete but also didn't fall into excluded categories
 # This reveals data quality issues that need special handling
-bios.loc[(
-    ~bios['Roles'].str.contains('Competed in Olympic Games')) 
-    & (~bios['Roles'].str.contains('Non-starter')) 
-    & (~bios['Roles'].str.contains('Intercalated Games'))
-    & (~bios['Roles'].str.contains('Youth Olympic Games'))
-    ]
+# A single alternation matches any of the known roles in one pass over the column
+if DEBUG:
+    known_roles = bios['Roles'].str.contains(
+        r'Competed in Olympic Games|Non-starter|Intercalated Games|Youth Olympic Games',
+        regex=True, na=False)
+    display(bios.loc[~known_roles])
 
 # %%
 # Sample records with titles to understand data patterns
 # Helps determine how to handle or preserve this information
-bios.loc[bios['Title(s)'].notna()].sample(10)
+if DEBUG:
+    display(bios.loc[bios['Title(s)'].notna()].sample(10))
 
 # %%
 # Examine nationality data distribution and format
 # Important for deciding data retention strategy
-bios.loc[bios['Nationality'].notna()].sample(10)
+if DEBUG:
+    display(bios.loc[bios['Nationality'].notna()].sample(10))
 
 # %% [markdown]
 # ### `results` Dataset Analysis
@@ -79,21 +121,19 @@ bios.loc[bios['Nationality'].notna()].sample(10)
 # %%
 # Review the structure of competition results data
 # Look for parsing needs and data consistency issues
-results.head(15)
+if DEBUG:
+    display(results.head(15))
 
 # %%
 # Assess data quality: types, missing values, structure
-results.info()
-
-# %%
-# Check nationality information in results
-# Determine if this duplicates bios data or provides additional value
-results.loc[results['Nationality'].notna()]
+if DEBUG:
+    results.info()
 
 # %%
 # Example of how athlete competition data is structured
 # Shows the relationship between bios and results datasets
-results.loc[results['athlete_id']==98904]
+if DEBUG:
+    display(results.loc[results['athlete_id']==98904])
 
 # %% [markdown]
 # ## Data Cleaning Strategy
@@ -127,7 +167,7 @@ results.loc[results['athlete_id']==98904]
 # 
 # ### `results` Dataset Transformations:
 #  
-# 1. **Column Cleanup:**
+# 1. **Column Cleanup** (skipped when loading the dataset):
 #    - Drop `Unnamed: 7` (empty column)
 #    - Drop `Nationality` (will use from `bios` dataset via `athlete_id` join)
 #    - Drop `As` column (redundant with `Used name`)
@@ -142,25 +182,21 @@ results.loc[results['athlete_id']==98904]
 # ### Establishing `name` column
 
 # %%
-# Create a working copy to preserve original data (prevents name binding issues)
-bios_new = bios.copy()
-
-# %%
-# Remove redundant name-related columns
-# Keep only the most commonly used name format
-bios_new.drop(columns=['Original name','Name order','Other names','Nick/petnames','Full name'], inplace=True)
-bios_new.head()
-
-# %%
-# Standardize column naming convention
-bios_new.rename(columns={'Used name': 'name'}, inplace=True)
-bios_new.head()
+# Create the working dataset from the columns that are kept (preserves original data without a full copy)
+# Redundant name-related columns are left out, keeping only the most commonly used name format
+# Standardize column naming convention for the name column
+bios_new = (bios[['athlete_id','Sex','Used name','Born','Died','Measurements','Roles','NOC','Nationality','Title(s)','Affiliations']]
+    .rename(columns={'Used name': 'name'}))
+if DEBUG:
+    display(bios_new.head())
 
 # %%
 # Replace bullet separator with standard space
 # This normalizes name formatting across all records
-bios_new['name'] = bios_new['name'].str.replace('•',' ')
-bios_new.head()
+# A literal (non-regex) replacement runs as Arrow's replace_substring kernel
+bios_new['name'] = bios_new['name'].str.replace('•',' ', regex=False)
+if DEBUG:
+    display(bios_new.head())
 
 # %% [markdown]
 # ### Filtering Olympic Competitors Based on `Roles` Column
@@ -168,189 +204,192 @@ bios_new.head()
 # %%
 # Filter to include only athletes who competed in official Olympic Games
 # Excludes non-starters, intercalated games, and youth olympics
-bios_new = bios_new.loc[bios_new['Roles'].str.contains('Competed in Olympic Games')]
-bios_new
+bios_new = bios_new.loc[competed_olympics]
+if DEBUG:
+    display(bios_new)
 
 # %%
 # Extract additional roles beyond Olympic competition
 # Clean formatting and handle cases with only Olympic competition
+# A single regex pass removes the Olympic role and the • separator left at the start
 bios_new['additional_roles'] = (bios_new['Roles']
-    .str.replace('Competed in Olympic Games','')
-    .str.replace(r'^\s*•\s*', '', regex=True) # Only remove • at the start
+    .str.replace(r'^(?:Competed in Olympic Games)?\s*•\s*|Competed in Olympic Games', '', regex=True)
     .replace('',np.nan) # Convert empty strings to NaN
 )
-bios_new.head()
-
-# %%
-# Remove original roles column as information is now split appropriately
-bios_new.drop(columns='Roles', inplace=True)
-bios_new.head()
+if DEBUG:
+    display(bios_new.head())
 
 # %% [markdown]
 # ### Creating `died_date` Column
 
 # %%
 # Extract death date from died column
-# Split on 'in ' to separate date from location information
-bios_new['died_date'] = bios_new['Died'].str.split('in ').str[0]
-bios_new.head()
+# Everything before ' in ' is the date, the location information is discarded
+# Arrow-backed extracts return '' for groups that did not match, so those are converted to missing values
+bios_new['died_date'] = (bios_new['Died']
+    .str.extract(r'^(?P<died_date>.*?)(?:(?:^|\s+)in\s+.*)?$', expand=False)
+    .replace('', pd.NA))
+if DEBUG:
+    display(bios_new.head())
 
 # %%
 # Validate date extraction format
-bios_new.loc[bios_new['died_date'].str.match('1967', na=False)]
+if DEBUG:
+    display(bios_new.loc[bios_new['died_date'].str.match('1967', na=False)])
 
 # %%
 # Check for inconsistent formatting patterns
-bios_new.loc[bios_new['died_date'].str.contains('In', na=False)]
+if DEBUG:
+    display(bios_new.loc[bios_new['died_date'].str.contains('In', na=False)])
 
 # %% [markdown]
 # **Note**: Converting `died_date` column to datetime format isn't feasible due to inconsistent date formats throughout the dataset.
 # 
 
-# %%
-# Remove original died column as relevant information has been extracted
-bios_new.drop(columns='Died', inplace=True)
-bios_new.head()
-
 # %% [markdown]
 # ### Splitting `Born` Column
 
 # %%
-# Extract birth date using same pattern as death date
-# Split on 'in ' to separate date from location
-bios_new['born_date'] = bios_new['Born'].str.split('in ').str[0]
-bios_new.head()
+# Split birth information into date, city, region and country in a single pass
+# Format: '<date> in <city>, <region> (<country>)' where the location part is optional
+# City and region are only filled when separated by a comma, country is the last parenthesized value
+# Cities may carry a parenthesized alias, e.g. 'Köln (Cologne), Nordrhein-Westfalen (GER)'
+born_pattern = (r'^(?P<born_date>.*?)'
+                r'(?:(?:^|\s+)in\s+'
+                r'(?:(?P<born_city>(?:[^,(]|\([^)]*\))+?)\s*,\s*(?P<born_region>[^(]+?)|[^(]*?)'
+                r'\s*(?:(?:\([^)]*\)\s*)*\((?P<born_country>[^)]+)\))?)?\s*$')
+bios_new[['born_date','born_city','born_region','born_country']] = bios_new['Born'].str.extract(born_pattern).replace('', pd.NA)
+
+# Location parts missing from the Born text must be null rather than empty strings
+assert not bios_new[['born_date','born_city','born_region','born_country']].eq('').any().any()
+if DEBUG:
+    display(bios_new.sample(10))
 
 # %%
 # Check for date format variations that prevent datetime conversion
-bios_new.loc[bios_new['born_date'].str.contains("c. 1929", regex=False, na=False)]
+if DEBUG:
+    display(bios_new.loc[bios_new['born_date'].str.contains("c. 1929", regex=False, na=False)])
 
 # %% [markdown]
 # **Note**: Converting `born_date` column to datetime format isn't feasible due to various date formats including approximate dates (e.g., "c. 1929").
 # 
 
-# %%
-# Extract country information from parentheses
-# Use regex to find content within parentheses, take the last match
-bios_new['born_country'] = (bios_new['Born']
-    .str.findall(r'\(([^)]+)\)') # Find all text in parentheses
-    .str[-1])  # Get last match (in case of multiple parentheses)
-bios_new.sample(10)
-
-# %%
-# Extract city name between 'in ' and first comma
-bios_new['born_city'] = bios_new['Born'].str.extract(r'in ([^,]+),') # Extract text between 'in ' and first comma
-bios_new.sample(10)
-
 # %%
 # Handle special cases like unknown cities marked with '?'
-bios_new.loc[bios_new['Born'] == '7 May 1983 in ? (KOR)']
-
-# %%
-# Extract region/state information between first comma and parentheses
-bios_new['born_region'] = bios_new['Born'].str.extract(r',\s*([^(]+)') #Extract text between first comma and opening parenthesis
-bios_new.sample(10)
-
-# %%
-# Remove original born column as information has been properly split
-bios_new.drop(columns='Born', inplace=True)
-bios_new.head()
+if DEBUG:
+    display(bios_new.loc[bios_new['Born'] == '7 May 1983 in ? (KOR)'])
 
 # %% [markdown]
 # ### Splitting `Measurements` Column
 
 # %%
 # Extract height and weight from measurements string
-# Split by ' / ' separator and extract numeric values
-bios_new['height_cm'] = bios_new['Measurements'].str.split(' / ').str[0].str.split(' ').str[0]
-bios_new['weight_kg'] = bios_new['Measurements'].str.split(' / ').str[1].str.split(' ').str[0]
-bios_new.sample(10)
+# Format: '<height> cm / <weight> kg' where either part may be missing
+bios_new[['height_cm','weight_kg']] = bios_new['Measurements'].str.extract(
+    r'^(?:(?P<height_cm>\d+(?:\.\d+)?)\s*cm)?(?:\s*/\s*)?(?:(?P<weight_kg>\d+(?:\.\d+)?)\s*kg)?').replace('', pd.NA)
+if DEBUG:
+    display(bios_new.sample(10))
 
 # %%
-# Remove original measurements column as data has been split into specific columns
-bios_new.drop(columns='Measurements', inplace=True)
-bios_new.head()
+# Check for malformed measurements that the pattern could not parse
+# Example: "74," or ranges like "60-64 kg" indicate incomplete or incorrectly formatted data
+if DEBUG:
+    display(bios_new.loc[bios_new['Measurements'].notna() & bios_new['height_cm'].isna() & bios_new['weight_kg'].isna()])
 
 # %% [markdown]
 # ### Formatting columns
 
+# %%
+# Remove original columns whose information has been split into the new columns
+bios_new = bios_new.drop(columns=['Roles','Died','Born','Measurements'])
+if DEBUG:
+    display(bios_new.head())
+
 # %%
 # Reorder columns for logical data organization
 # Group related information together (identity, birth, death, physical, roles)
 bios_new = bios_new.loc[:,['athlete_id','Sex','name','born_date','born_city','born_region','born_country','NOC','Nationality','died_date','height_cm','weight_kg','Title(s)','additional_roles','Affiliations']]
-bios_new.head()
+if DEBUG:
+    display(bios_new.head())
 
 # %%
 # Standardize column names to lowercase for consistency
-bios_new.rename(columns={'Sex':'sex','Nationality':'nationality','Title(s)':'title(s)','Affiliations':'affiliations'}, inplace=True)
-bios_new.head()
+bios_new = bios_new.rename(columns={'Sex':'sex','Nationality':'nationality','Title(s)':'title(s)','Affiliations':'affiliations'})
+if DEBUG:
+    display(bios_new.head())
 
 # %%
 # Review final dataset structure
-bios_new.info()
-
-# %%
-# Check for malformed height entries that contain commas or other formatting issues
-# This identifies data quality problems from the original measurements parsing
-# Example: "74," indicates incomplete or incorrectly formatted measurement data
-bios_new.loc[bios_new['height_cm']=='74,']
+if DEBUG:
+    bios_new.info()
 
 # %%
 # Convert height and weight to numeric format for mathematical operations
 # errors='coerce' converts invalid/non-numeric values to NaN instead of raising errors
 # This handles cases like missing data, text entries, or malformed measurements
-bios_new['height_cm'] = pd.to_numeric(bios_new['height_cm'], errors='coerce')
-bios_new['weight_kg'] = pd.to_numeric(bios_new['weight_kg'], errors='coerce')
-bios_new.info()
+# Heights and weights fit comfortably in float32, halving memory compared to the float64 default
+bios_new['height_cm'] = pd.to_numeric(bios_new['height_cm'], errors='coerce', downcast='float').astype('float32')
+bios_new['weight_kg'] = pd.to_numeric(bios_new['weight_kg'], errors='coerce', downcast='float').astype('float32')
+if DEBUG:
+    bios_new.info()
+
+# %%
+# Store low-cardinality columns as categoricals
+# Groupbys and comparisons then work on small integer codes instead of strings
+# athlete_id becomes a compact integer key for joining with results dataset
+bios_new = bios_new.astype({'athlete_id': 'int32', 'sex': 'category', 'NOC': 'category', 'nationality': 'category'})
+if DEBUG:
+    bios_new.info()
 
 # %%
 # Export cleaned dataset for future use
-bios_new.to_csv('bios_new.csv', index=False)
+# Parquet keeps the column dtypes (numeric measurements, categoricals) and is written in compressed column chunks
+bios_new.to_parquet('bios_new.parquet', engine='pyarrow', compression='snappy', index=False)
 
 # %% [markdown]
 # ## Cleaning `results` Dataset
 
-# %% [markdown]
-# ### Dropping Unnecessary Columns
-
-# %%
-# Create working copy to preserve original results data (and avoid name binding issues)
-results_new = results.copy()
-results_new.head()
-
-# %%
-# Remove columns that are empty, redundant, or will be sourced from bios dataset
-# Unnamed: 7 is completely empty, Nationality will come from bios via athlete_id join
-# As column is redundant since name on `bios` dataset exists
-results_new.drop(columns=['Unnamed: 7','Nationality','As'], inplace=True)
-results_new.head()
-
 # %% [markdown]
 # ### Formatting columns
 
 # %%
 # Standardize column names to lowercase for consistency with bios dataset
 # Improve readability by using more descriptive names where appropriate
-results_new.rename(columns = {'Games':'games','Event':'event','Team':'team','Pos':'position','Medal':'medal','Discipline':'discipline'}, inplace=True)
-results_new.head()
+# Renaming creates the working dataset, so the original results data is preserved without an extra copy
+results_new = results.rename(columns = {'Games':'games','Event':'event','Team':'team','Pos':'position','Medal':'medal','Discipline':'discipline'})
+if DEBUG:
+    display(results_new.head())
 
 # %%
 # Reorder columns for logical organization
 # Place athlete_id first as primary key, followed by competition details
 results_new = results_new.loc[:,['athlete_id','NOC','games','event','team','position','medal','discipline']]
-results_new.head()
+if DEBUG:
+    display(results_new.head())
+
+# %%
+# Store athlete_id as a compact integer key for joining with bios dataset
+results_new['athlete_id'] = results_new['athlete_id'].astype('int32')
+if DEBUG:
+    results_new.info()
 
 # %%
 # Export cleaned results dataset for analysis and potential joining with bios data
-results_new.to_csv('results_new.csv', index=False)
+results_new.to_parquet('results_new.parquet', engine='pyarrow', compression='snappy', index=False)
 
 # %% [markdown]
 # ## Exploring the Cleaned Data
 
+# %%
+# Index both datasets by athlete_id and sort them
+# Joins on sorted integer indexes avoid hashing the key column for every row
+bios_indexed = bios_new.set_index('athlete_id').sort_index()
+results_indexed = results_new.set_index('athlete_id').sort_index()
+
 # %%
 # Analyze gender distribution among Olympic competitors
 # This provides baseline demographics for the dataset
-bios_new.groupby(bios_new['sex']).count()
+bios_new.groupby(bios_new['sex'], observed=True).count()
 
 # %%
 # Identify female athletes with official titles or honors
@@ -361,14 +400,19 @@ bios_female_title
 # %%
 # Cross-reference titled female athletes with their medal achievements
 # Determines if formal recognition correlates with Olympic success
-bios_female_title_results = pd.merge(left=bios_female_title, right=results_new, how='left', on='athlete_id')
+bios_female_title_results = (bios_female_title.set_index('athlete_id')
+    .join(results_indexed, how='left', lsuffix='_x', rsuffix='_y')
+    .reset_index())
 
 bios_female_title_results.loc[bios_female_title_results['medal'].notna(),['athlete_id','name','born_date','born_country','NOC_x','nationality','NOC_y','title(s)','games','discipline','medal']]
 
 # %%
 # Investigate athletes who competed for different countries than their birth country
 # This reveals patterns of athletic migration and dual citizenship
-bios_results = pd.merge(left=bios_new,right=results_new, how='inner',on='athlete_id')
+# Only the columns used below are joined to keep the joined dataset small
+bios_results = (bios_indexed[['sex','name','born_date','nationality','born_country','NOC']]
+    .join(results_indexed[['NOC','position','discipline']], how='inner', lsuffix='_x', rsuffix='_y')
+    .reset_index())
 
 bios_results.loc[
     (bios_results['NOC_y'].notna()) &